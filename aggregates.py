@@ -0,0 +1,181 @@
+# Typed aggregate model
+#
+# The dashboard aggregates are small, but every worker holds them and every
+# filter/group-by runs over them. Dimensions are stored as categoricals so
+# comparisons run on integer codes, time buckets are integer slot indexes
+# (formatted only for display), months carry their year (int16), counts are
+# int32 and percentages float32.
+# Volumes stay float64: float32 cannot represent KES billions to the cent.
+# Every frame is validated against its schema when it is loaded.
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+MONTHS = [
+    'January', 'February', 'March', 'April', 'May', 'June', 'July',
+    'August', 'September', 'October', 'November', 'December'
+]
+MONTH_DTYPE = pd.CategoricalDtype(MONTHS, ordered=True)
+
+# Half-hour buckets: slot 0 is 12:00 AM, slot 47 is 11:30 PM
+SLOT_MINUTES = 30
+HOUR_SLOTS = 24 * 60 // SLOT_MINUTES
+
+# Largest rounding error tolerated when narrowing a measure to float32
+FLOAT32_TOLERANCE = 0.005
+
+Schema = namedtuple('Schema', ['key', 'columns', 'percent'])
+
+SCHEMAS = {
+    'monthly': Schema(
+        key=['Year', 'Month'],
+        columns={
+            'Year': 'int16',
+            'Month': MONTH_DTYPE,
+            'Transactions': 'int32',
+            'Volume': 'float64',
+            'Success_Rate': 'float32',
+            'Unique_Remitters': 'int32',
+            'Unique_Recipients': 'int32'
+        },
+        percent=['Success_Rate']
+    ),
+    'failure': Schema(
+        key=['Reason'],
+        columns={
+            'Reason': 'category',
+            'Total': 'int32',
+            'Percentage': 'float32'
+        },
+        percent=['Percentage']
+    ),
+    'country': Schema(
+        key=['Country'],
+        columns={
+            'Country': 'category',
+            'Volume': 'float64',
+            'Count': 'int32',
+            'Market_Share': 'float32'
+        },
+        percent=['Market_Share']
+    ),
+    'client': Schema(
+        key=['Client'],
+        columns={
+            'Client': 'category',
+            'Volume': 'float64',
+            'Transactions': 'int32',
+            'Market_Share': 'float32'
+        },
+        percent=['Market_Share']
+    ),
+    'corridor': Schema(
+        key=['Sender_Country', 'Recipient_Region', 'Recipient_City'],
+        columns={
+            'Sender_Country': 'category',
+            'Recipient_Region': 'category',
+            'Recipient_City': 'category',
+            'Volume': 'float64',
+            'Count': 'int32'
+        },
+        percent=[]
+    ),
+    'hourly': Schema(
+        key=['Slot'],
+        columns={
+            'Slot': 'int8',
+            'Volume': 'float64',
+            'Count': 'int32'
+        },
+        percent=[]
+    )
+}
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def _cast(name, column, values, dtype):
+    if values.isna().any():
+        raise SchemaError(f"{name}.{column}: missing values")
+
+    typed = values.astype(dtype)
+    if isinstance(typed.dtype, pd.CategoricalDtype):
+        # Values outside a fixed category list silently become NaN
+        if typed.isna().any():
+            unknown = sorted(set(values[typed.isna()]))
+            raise SchemaError(f"{name}.{column}: unknown categories {unknown}")
+        # A fixed list (e.g. all twelve months) validates; only the values present
+        # are kept, still in list order, so short frames don't carry unused labels
+        return typed.cat.remove_unused_categories()
+
+    if not pd.api.types.is_numeric_dtype(values):
+        raise SchemaError(f"{name}.{column}: expected numbers, got {values.dtype}")
+    if (values < 0).any():
+        raise SchemaError(f"{name}.{column}: negative values")
+    if pd.api.types.is_integer_dtype(typed):
+        if not np.array_equal(typed.to_numpy('int64'), values.to_numpy('float64')):
+            raise SchemaError(f"{name}.{column}: values do not fit {dtype}")
+    elif typed.dtype == np.float32:
+        error = np.abs(typed.to_numpy('float64') - values.to_numpy('float64')).max()
+        if error > FLOAT32_TOLERANCE:
+            raise SchemaError(f"{name}.{column}: float32 loses precision ({error:g})")
+    return typed
+
+
+def load(name, raw):
+    """Build the typed aggregate ``name`` from raw column data and validate it."""
+    schema = SCHEMAS[name]
+    frame = pd.DataFrame(raw)
+
+    missing = set(schema.columns) - set(frame.columns)
+    extra = set(frame.columns) - set(schema.columns)
+    if missing or extra:
+        raise SchemaError(f"{name}: missing columns {sorted(missing)}, unexpected {sorted(extra)}")
+
+    frame = pd.DataFrame({
+        column: _cast(name, column, frame[column], dtype)
+        for column, dtype in schema.columns.items()
+    })
+
+    if frame.duplicated(schema.key).any():
+        raise SchemaError(f"{name}: duplicate {schema.key} keys")
+    for column in schema.percent:
+        if (frame[column] > 100).any():
+            raise SchemaError(f"{name}.{column}: percentage above 100")
+    if name == 'hourly' and (frame['Slot'] >= HOUR_SLOTS).any():
+        raise SchemaError(f"{name}.Slot: slot outside 0-{HOUR_SLOTS - 1}")
+    return frame
+
+
+# Display helpers
+def hour_label(slot):
+    minutes = int(slot) * SLOT_MINUTES
+    hour, minute = divmod(minutes, 60)
+    suffix = 'AM' if hour < 12 else 'PM'
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {suffix}"
+
+
+def hour_labels(slots):
+    return [hour_label(slot) for slot in slots]
+
+
+def month_key(year, month):
+    # Sortable period key, e.g. '2024-09'
+    return f"{int(year)}-{MONTHS.index(month) + 1:02d}"
+
+
+def month_keys(monthly):
+    return [month_key(year, month) for year, month in zip(monthly['Year'], monthly['Month'])]
+
+
+def month_key_label(key):
+    year, month = key.split('-')
+    return f"{MONTHS[int(month) - 1]} {year}"
+
+
+def widen(series, decimals=2):
+    # float32 -> float64 for plotting, without exposing float32 noise in hovers
+    return series.astype('float64').round(decimals)
@@ -0,0 +1,153 @@
+# Cohort and retention analysis
+#
+# Builds monthly remitter cohorts (first-transfer month x active month) per
+# client from a transaction ledger without a self-join. Remitter IDs are
+# integer-encoded, the ledger is sorted once by (client, remitter, month) so
+# each remitter's first month is the first row of its run, and the remitters
+# active in each month, and those first seen in it, are kept as roaring
+# bitmaps. A retention cell is then one bitmap intersection count.
+#
+# The ledger is a CSV export (LEDGER_DATA) with one row per transfer:
+#     Client, Remitter_ID, Date
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from pyroaring import BitMap
+
+from aggregates import SchemaError
+
+LEDGER_DATA = os.environ.get('LEDGER_DATA')
+LEDGER_COLUMNS = ['Client', 'Remitter_ID', 'Date']
+ALL_CLIENTS = 'All Clients'
+
+
+def load_ledger(path=LEDGER_DATA):
+    """Ledger columns needed for cohorts, or None when no ledger is configured."""
+    if not path:
+        return None
+    ledger = pd.read_csv(path, usecols=LEDGER_COLUMNS, parse_dates=['Date'])
+    if ledger[LEDGER_COLUMNS].isna().any().any():
+        raise SchemaError(f"ledger: missing values in {path}")
+    return ledger
+
+
+def load_cohort_engine(path=LEDGER_DATA):
+    ledger = load_ledger(path)
+    return CohortEngine(ledger) if ledger is not None else None
+
+
+def _month_label(month):
+    return pd.Timestamp(year=int(month) // 12, month=int(month) % 12 + 1, day=1).strftime('%b %Y')
+
+
+def _group_bitmaps(keys, users, n_keys):
+    # One BitMap per key from a single stable sort, sliced at key boundaries
+    order = np.argsort(keys, kind='stable')
+    keys, users = keys[order], users[order]
+    bounds = np.searchsorted(keys, np.arange(n_keys + 1))
+    return [BitMap(users[bounds[k]:bounds[k + 1]]) for k in range(n_keys)]
+
+
+class CohortEngine:
+    """Per-client monthly cohort bitmaps built from a transfer ledger."""
+
+    def __init__(self, ledger):
+        client_codes, clients = pd.factorize(ledger['Client'], sort=True)
+        user_codes, _ = pd.factorize(ledger['Remitter_ID'])
+        dates = ledger['Date']
+        months = (dates.dt.year * 12 + dates.dt.month - 1).to_numpy('int64')
+
+        self.first_month = int(months.min())
+        self.n_months = int(months.max()) - self.first_month + 1
+        self.months = [_month_label(self.first_month + m) for m in range(self.n_months)]
+        self.clients = [str(c) for c in clients]
+
+        month_codes = (months - self.first_month).astype('int32')
+        user_codes = user_codes.astype('uint32')
+        client_codes = client_codes.astype('int32')
+
+        # Every client on its own, then all clients as a single one
+        self._active = {}
+        self._cohorts = {}
+        for codes, names in [(client_codes, self.clients), (np.zeros_like(client_codes), [ALL_CLIENTS])]:
+            active, cohorts = self._build(codes, user_codes, month_codes, len(names))
+            for index, name in enumerate(names):
+                window = slice(index * self.n_months, (index + 1) * self.n_months)
+                self._active[name] = active[window]
+                self._cohorts[name] = cohorts[window]
+
+        digest = hashlib.sha1()
+        for array in (client_codes, user_codes, month_codes):
+            digest.update(array.tobytes())
+        self.fingerprint = digest.hexdigest()[:12]
+
+    def _build(self, client_codes, user_codes, month_codes, n_clients):
+        # One sorted pass: the first row of each (client, remitter) run is its first month
+        order = np.lexsort((month_codes, user_codes, client_codes))
+        clients, users, months = client_codes[order], user_codes[order], month_codes[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (clients[1:] != clients[:-1]) | (users[1:] != users[:-1])
+
+        # Bitmaps are laid out client-major: key = client * n_months + month
+        active_keys = clients.astype('int64') * self.n_months + months
+        n_keys = n_clients * self.n_months
+        active = _group_bitmaps(active_keys, users, n_keys)
+        cohorts = _group_bitmaps(active_keys[first], users[first], n_keys)
+        return active, cohorts
+
+    def retention(self, client=ALL_CLIENTS):
+        """Cohort sizes and a cohort x active month matrix of retained remitters."""
+        active = self._active[client]
+        cohorts = self._cohorts[client]
+        sizes = np.array([len(cohort) for cohort in cohorts], dtype='int64')
+        retained = np.full((self.n_months, self.n_months), np.nan)
+        for c, cohort in enumerate(cohorts):
+            if not cohort:
+                continue
+            for m in range(c, self.n_months):
+                retained[c, m] = cohort.intersection_cardinality(active[m])
+        return sizes, retained
+
+
+def build_retention_figure(engine, client=ALL_CLIENTS):
+    sizes, retained = engine.retention(client)
+    keep = sizes > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rates = retained[keep] / sizes[keep, None] * 100
+    cohorts = [f"{label} ({size:,})" for label, size in zip(engine.months, sizes) if size]
+    # Months before a cohort existed stay blank rather than reading 0%
+    labels = [['' if np.isnan(rate) else f"{rate:.0f}%" for rate in row] for row in rates]
+
+    return go.Figure(go.Heatmap(
+        z=rates,
+        x=engine.months,
+        y=cohorts,
+        customdata=retained[keep],
+        colorscale='Blues',
+        zmin=0,
+        zmax=100,
+        text=labels,
+        texttemplate='%{text}',
+        textfont=dict(size=10),
+        colorbar=dict(title='Retained', ticksuffix='%', thickness=12),
+        hovertemplate=(
+            "<b>Cohort %{y}</b><br>" +
+            "Active in %{x}: %{customdata:,.0f}<br>" +
+            "Retention: %{z:.1f}%<br>" +
+            "<extra></extra>"
+        ),
+        hoverongaps=False
+    )).update_layout(
+        title={
+            'text': f'Monthly Remitter Retention ({client})',
+            'y': 0.95
+        },
+        xaxis=dict(title='Active Month', showgrid=False),
+        yaxis=dict(title='First-Transfer Month (Cohort Size)', autorange='reversed', showgrid=False),
+        plot_bgcolor='white',
+        height=400,
+        margin=dict(l=50, r=50, t=50, b=60)
+    )
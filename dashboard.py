@@ -0,0 +1,131 @@
+# Dash application
+#
+# Builds the Dash app: page template, layout, callbacks and response caching.
+# app1.py imports this module on the first request that needs the dashboard.
+import os
+import sys
+
+import dash
+import dash_bootstrap_components as dbc
+from dash.dependencies import Input, Output, State
+
+import aggregates
+import cohorts
+import data
+import figures
+import geo
+import layout
+from figures import build_geo_view
+from layout import build_layout
+from response_cache import code_version, install_response_cache
+from startup import timed
+
+# Custom CSS
+INDEX_STRING = '''<!DOCTYPE html>
+<html>
+    <head>
+        {%metas%}
+        <title>{%title%}</title>
+        {%favicon%}
+        {%css%}
+        <style>
+            * {
+                font-family: 'Bebas Neue', sans-serif;
+            }
+            .regular-text {
+                font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
+            }
+            .card-body p, .card-body text {
+                font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
+            }
+            .card {
+                margin-bottom: 1rem;
+            }
+            .client-logo {
+                width: 60px;
+                height: 30px;
+                object-fit: contain;
+                margin: 5px;
+                padding: 5px;
+                background-color: #ffffff;
+                border-radius: 4px;
+                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+            }
+        </style>
+    </head>
+    <body>
+        {%app_entry%}
+        <footer>
+            {%config%}
+            {%scripts%}
+            {%renderer%}
+        </footer>
+    </body>
+</html>'''
+
+def create_app():
+    app = dash.Dash(
+        __name__, 
+        external_stylesheets=[
+            dbc.themes.FLATLY,
+            'https://fonts.googleapis.com/css2?family=Bebas+Neue&display=swap'
+        ]
+    )
+    app.index_string = INDEX_STRING
+
+    with timed('layout_build'):
+        app.layout = build_layout(app)
+    register_callbacks(app)
+
+    # Response caching: keys and ETags follow the data and the rendering code,
+    # Last-Modified the newest of those source files and the data exports
+    sources = [sys.modules[__name__], aggregates, cohorts, data, figures, geo, layout]
+    code = code_version(sources, extra=[dash.__version__, dbc.__version__])
+    data_files = [path for path in (geo.CORRIDOR_DATA, cohorts.LEDGER_DATA) if path]
+    install_response_cache(
+        app,
+        f"{data.data_version()}-{code}",
+        max(os.path.getmtime(path) for path in [module.__file__ for module in sources] + data_files),
+        deterministic_outputs=[
+            'geo-drill.data',
+            'cohort-heatmap.figure',
+            '..geo-map.figure...geo-breadcrumb.children...geo-unplaced.children..'
+        ]
+    )
+    return app
+
+
+def register_callbacks(app):
+    # Geographic drill-down callbacks (only when some country has placeable regions)
+    if data.geo_aggregates.drillable:
+        @app.callback(
+            Output('geo-drill', 'data'),
+            Input('geo-map', 'clickData'),
+            Input('geo-back', 'n_clicks'),
+            State('geo-drill', 'data'),
+            prevent_initial_call=True
+        )
+        def update_geo_drill(click_data, n_clicks, drill):
+            if dash.ctx.triggered_id == 'geo-back':
+                return geo.drill_up(drill)
+            return geo.drill_down(data.geo_aggregates, drill, click_data)
+
+        @app.callback(
+            Output('geo-map', 'figure'),
+            Output('geo-breadcrumb', 'children'),
+            Output('geo-unplaced', 'children'),
+            Input('geo-drill', 'data'),
+            prevent_initial_call=True
+        )
+        def update_geo_map(drill):
+            return build_geo_view(data.geo_aggregates, drill or {})
+
+    # Cohort heatmap callback (the card is only in the layout with a ledger)
+    if data.cohort_engine is not None:
+        @app.callback(
+            Output('cohort-heatmap', 'figure'),
+            Input('cohort-client', 'value'),
+            prevent_initial_call=True
+        )
+        def update_cohort_heatmap(client):
+            return cohorts.build_retention_figure(data.cohort_engine, client)
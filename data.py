@@ -0,0 +1,89 @@
+# Dashboard data
+#
+# Aggregate frames behind the dashboard, validated through aggregates.py, and
+# the geo and cohort structures derived from them. Importing this module loads
+# pandas and builds everything, so the web entry point defers it to first use.
+import hashlib
+
+import pandas as pd
+
+import aggregates
+import cohorts
+import geo
+
+# Monthly data
+monthly_data = aggregates.load('monthly', {
+    'Year': [2024] * 7,
+    'Month': ['June', 'July', 'August', 'September', 'October', 'November', 'December'],
+    'Transactions': [3239, 6147, 7311, 5853, 9986, 11574, 8217],
+    'Volume': [164960577.05, 344641363.80, 441605577.75, 333896656.06, 
+               612844465.61, 660334518.30, 523575404.54],
+    'Success_Rate': [76.97, 82.43, 85.21, 79.07, 84.20, 78.33, 86.84],
+    'Unique_Remitters': [1179, 2337, 2845, 2422, 3561, 3784, 3367],
+    'Unique_Recipients': [1669, 3076, 3265, 2704, 4139, 4366, 3858]
+})
+
+# Failure data
+failure_data = aggregates.load('failure', {
+    'Reason': ['Insufficient Balance', 'Timed Out', 'Invalid Account', 'Other',
+               'General Failure', 'Invalid Details', 'Invalid Credit Party'],
+    'Total': [4219, 1286, 1174, 1193, 754, 430, 223],
+    'Percentage': [45.29, 13.80, 12.60, 12.81, 8.09, 4.62, 2.39]
+})
+
+# Country data 
+country_data = aggregates.load('country', {
+    'Country': ['USA', 'GBR', 'CAN', 'KEN', 'Unknown'],
+    'Volume': [1348601980.70, 1263989309.40, 131969949.47, 109322547.12, 203331985.30],
+    'Count': [15011, 20520, 2544, 1753, 2304],
+    'Market_Share': [43.79, 41.04, 4.28, 3.55, 6.60]
+})
+
+# Corridor data (sender country -> KEN recipient region and city)
+corridor_data = geo.load_corridors(country_data)
+geo_aggregates = geo.GeoAggregates(corridor_data)
+
+# Remitter cohorts (only when a transfer ledger export is configured)
+cohort_engine = cohorts.load_cohort_engine()
+
+# Client data 
+client_data = aggregates.load('client', {
+    'Client': ['Lemfi', 'DLocal', 'Nala', 'Wapipay'],
+    'Volume': [2686506229.61, 353927405.68, 23023985.63, 18400642.19],
+    'Transactions': [38712, 3928, 286, 99],
+    'Market_Share': [87.17, 11.48, 0.75, 0.60]
+})
+
+# 24-hour data (half-hour slots)
+hourly_data = aggregates.load('hourly', {
+    'Slot': list(range(aggregates.HOUR_SLOTS)),
+    'Volume': [
+        31422733.80, 34824950.20, 37178383.70, 39343104.80, 33641452.40, 32227031.80,
+        34648925.80, 32454662.20, 42374824.70, 43128807.70, 46059732.10, 57139036.40,
+        58015932.50, 62236995.30, 60833204.50, 55974572.20, 77837841.00, 67626737.50,
+        84461058.30, 75435087.40, 67624749.70, 79260334.80, 76847398.60, 73021931.70,
+        84368774.00, 76140912.70, 92760212.00, 105426317.00, 99512228.50, 105454542.00,
+        98766290.10, 88942862.10, 90963921.30, 87242973.80, 82701870.30, 83827382.50,
+        84363714.10, 76609016.90, 66024103.70, 69091915.10, 66969157.00, 57814906.70,
+        51346076.60, 47763253.40, 52829165.80, 41435365.70, 33925854.50, 33958558.20
+    ],
+    'Count': [
+        438, 449, 517, 510, 450, 418, 441, 469, 546, 574, 633, 774,
+        820, 815, 843, 789, 1026, 980, 1131, 1095, 1020, 1120, 1067, 1045,
+        1129, 1060, 1243, 1359, 1288, 1383, 1366, 1281, 1254, 1237, 1228, 1164,
+        1172, 1093, 997, 990, 944, 887, 801, 753, 727, 644, 551, 509
+    ]
+})
+
+# Headline success rate (transaction-weighted, not a mean of monthly rates)
+SUCCESS_RATE = 81.87
+
+# Data version: changes whenever any aggregate frame changes
+def data_version():
+    frames = [monthly_data, failure_data, country_data, corridor_data, client_data, hourly_data]
+    digest = hashlib.sha1()
+    for frame in frames:
+        digest.update(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+    if cohort_engine is not None:
+        digest.update(cohort_engine.fingerprint.encode('utf-8'))
+    return digest.hexdigest()[:12]
@@ -0,0 +1,389 @@
+# Figure builders
+#
+# One function per dashboard figure. The layout, the callbacks and reports.py
+# all build figures through these, passing the data in explicitly.
+import plotly.graph_objects as go
+
+import aggregates
+import geo
+
+# Monthly volume and success rate
+def build_monthly_figure(monthly_data):
+    return go.Figure(data=[
+        go.Bar(
+            name='Volume',
+            x=monthly_data['Month'],
+            y=monthly_data['Volume']/1e6,
+            marker_color='rgb(66, 133, 244)',  
+            yaxis='y'
+        ),
+        go.Scatter(
+            name='Success Rate',
+            x=monthly_data['Month'],
+            y=aggregates.widen(monthly_data['Success_Rate']),
+            mode='lines+markers',
+            marker=dict(
+                size=6,
+                color='rgb(255, 159, 64)',  
+                line=dict(
+                    color='white',
+                    width=1
+                )
+            ),
+            line=dict(
+                width=2,
+                color='rgb(255, 159, 64)'
+            ),
+            yaxis='y2'
+        )
+    ]).update_layout(
+        title={
+            'text': 'Monthly Volume and Success Rate Trends',
+            'y': 0.95,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': dict(size=14)
+        },
+        yaxis=dict(
+            title='Volume (KES Millions)',
+            titlefont=dict(size=12),
+            tickfont=dict(size=10),
+            gridcolor='rgba(220,220,220,0.4)',
+            showgrid=True,
+            zeroline=False,
+            range=[0, max(monthly_data['Volume']/1e6) * 1.1]
+        ),
+        yaxis2=dict(
+            title='Success Rate (%)',
+            titlefont=dict(size=12),
+            tickfont=dict(size=10),
+            overlaying='y',
+            side='right',
+            range=[0, 100],
+            ticksuffix='%',
+            gridcolor='rgba(220,220,220,0.4)',
+            showgrid=False,
+            zeroline=False
+        ),
+        xaxis=dict(
+            showgrid=False,
+            tickfont=dict(size=11),
+            zeroline=False
+        ),
+        plot_bgcolor='rgba(240, 245, 255, 0.4)',  
+        paper_bgcolor='white',
+        height=400,
+        margin=dict(l=60, r=60, t=80, b=60),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        hovermode='x unified',
+        showlegend=True,
+        annotations=[dict(
+            text=f'Peak Month: {monthly_data["Month"].iloc[-1]} (KES {monthly_data["Volume"].iloc[-1]/1e6:.1f}M, {monthly_data["Success_Rate"].iloc[-1]:.1f}% SUCCESS RATE)',
+            xref='paper',
+            yref='paper',
+            x=0.5,
+            y=-0.2,
+            showarrow=False,
+            font=dict(size=11),
+            align='center'
+        )]
+    )
+
+# Success rate gauge
+def build_success_gauge(success_rate):
+    return go.Figure(
+        go.Indicator(
+            mode="gauge+number",
+            value=success_rate,
+            title={
+                "text": "Average Success Rate",
+                "font": {"size": 16, "color": "#2E7D32"}
+            },
+            number={
+                "suffix": "%",
+                "font": {"size": 28, "color": "#2E7D32"}
+            },
+            gauge={
+                'axis': {'range': [None, 100]},
+                'bar': {'color': "#81C784"},
+                'steps': [
+                    {'range': [0, 60], 'color': "rgba(129, 199, 132, 0.2)"},
+                    {'range': [60, 75], 'color': "rgba(129, 199, 132, 0.4)"},
+                    {'range': [75, 90], 'color': "rgba(129, 199, 132, 0.6)"}
+                ],
+                'threshold': {
+                    'line': {'color': "#4CAF50", 'width': 2},
+                    'thickness': 0.75,
+                    'value': success_rate
+                }
+            }
+        )
+    ).update_layout(
+        height=300,
+        margin=dict(l=30, r=30, t=30, b=30)
+    )
+
+# User activity metrics
+def build_user_activity_figure(monthly_data):
+    return go.Figure(data=[
+        go.Scatter(
+            x=[0.2, 0.5, 0.8],
+            y=[1.15, 1.15, 1.15],
+            mode='text',
+            text=['🌍', '👥', '👤'],
+            textfont=dict(size=24),
+            hoverinfo='none',
+            showlegend=False
+        ),
+        go.Scatter(
+            x=[0.2, 0.5, 0.8],
+            y=[1, 1, 1],
+            mode='text',
+            text=['Active Countries', 'Total Remitters', 'Total Recipients'],
+            textfont=dict(size=14),
+            hoverinfo='none',
+            showlegend=False
+        ),
+        go.Scatter(
+            x=[0.2, 0.5, 0.8],
+            y=[0.85, 0.85, 0.85],
+            mode='text',
+            text=[
+                f"16",  
+                f"{monthly_data['Unique_Remitters'].sum():,}",
+                f"{monthly_data['Unique_Recipients'].sum():,}"
+            ],
+            textfont=dict(size=24, color='#2E86C1'),
+            hoverinfo='none',
+            showlegend=False
+        )
+    ]).update_layout(
+        height=300,
+        showlegend=False,
+        xaxis=dict(
+            showgrid=False,
+            zeroline=False,
+            showticklabels=False,
+            range=[0, 1]
+        ),
+        yaxis=dict(
+            showgrid=False,
+            zeroline=False,
+            showticklabels=False,
+            range=[0.5, 1.2]
+        ),
+        margin=dict(l=20, r=20, t=20, b=20),
+        paper_bgcolor='white',
+        plot_bgcolor='white'
+    )
+
+# Geographic drill-down: map, breadcrumb and unplaced volume for a drill state
+def build_geo_view(geo_aggregates, drill):
+    country, region = drill.get('country'), drill.get('region')
+    figure = geo.build_geo_figure(geo_aggregates, country, region)
+    breadcrumb = ' › '.join(['All Countries'] + [level for level in (country, region) if level])
+    unplaced = geo.unplaced_volume(geo_aggregates, country, region)
+    return figure, breadcrumb, f"KES {unplaced/1e6:,.1f}M"
+
+# Failure treemap
+def build_failure_figure(failure_data):
+    return go.Figure(
+        go.Treemap(
+            labels=failure_data['Reason'],
+            parents=[''] * len(failure_data),
+            values=failure_data['Total'],
+            textinfo='label+value+percent parent',
+            hovertemplate=(
+                "<b>%{label}</b><br>" +
+                "Count: %{value}<br>" +
+                "Percentage: %{percentParent:.1%}<br>" +
+                "<extra></extra>"
+            ),
+            marker=dict(
+                colors=failure_data['Total'],
+                colorscale='Reds',
+                showscale=True
+            ),
+            textfont=dict(size=12)
+        )
+    ).update_layout(
+        title={
+            'text': 'Transaction Failure Distribution',
+            'y': 0.95
+        },
+        height=400,
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+
+# Hourly transaction pattern
+def build_hourly_figure(hourly_data):
+    hours = aggregates.hour_labels(hourly_data['Slot'])
+    return go.Figure(data=[
+        go.Scatter(
+            x=hours,
+            y=hourly_data['Volume']/1e6,
+            mode='lines+markers',
+            name='Volume',
+            marker=dict(
+                size=6,
+                color='rgba(26, 118, 255, 0.8)'
+            ),
+            line=dict(
+                width=2,
+                color='rgba(26, 118, 255, 0.8)'
+            ),
+            yaxis='y'
+        ),
+        go.Scatter(
+            x=hours,
+            y=hourly_data['Count'],
+            mode='lines+markers',
+            name='Transaction Count',
+            marker=dict(
+                size=6,
+                color='rgba(255, 128, 0, 0.8)'
+            ),
+            line=dict(
+                width=2,
+                color='rgba(255, 128, 0, 0.8)'
+            ),
+            yaxis='y2'
+        )
+    ]).update_layout(
+        title={
+            'text': 'Hourly Volume and Transaction Count Distribution',
+            'y': 0.95
+        },
+        xaxis_title='Hour of Day',
+        yaxis=dict(
+            title='Volume (KES Millions)',
+            titlefont=dict(color='rgba(26, 118, 255, 0.8)'),
+            tickfont=dict(color='rgba(26, 118, 255, 0.8)')
+        ),
+        yaxis2=dict(
+            title='Number of Transactions',
+            titlefont=dict(color='rgba(255, 128, 0, 0.8)'),
+            tickfont=dict(color='rgba(255, 128, 0, 0.8)'),
+            overlaying='y',
+            side='right'
+        ),
+        height=400,
+        margin=dict(l=50, r=50, t=50, b=100),
+        legend=dict(
+            orientation="h",
+            y=1.1,
+            x=0.5,
+            xanchor='center'
+        ),
+        xaxis=dict(
+            tickangle=-45,
+            tickmode='array',
+            ticktext=hours,
+            tickvals=list(range(len(hourly_data))),
+            dtick=2  
+        ),
+        hovermode='x unified'
+    )
+
+# Client market share
+def build_client_share_figure(client_data):
+    return go.Figure(
+        data=[go.Pie(
+            labels=client_data['Client'],
+            values=aggregates.widen(client_data['Market_Share']),
+            textinfo='label+percent',
+            hole=0.4,
+            marker=dict(
+                colors=[
+                    '#526DFF', '#FF6347', '#20B2AA', '#FF9F40'
+                ]
+            ),
+            hovertemplate=(
+                "<b>%{label}</b><br>" +
+                "Market Share: %{value:.1f}%<br>" +
+                "<extra></extra>"
+            )
+        )]
+    ).update_layout(
+        title={
+            'text': 'Market Share Distribution',
+            'y': 0.95
+        },
+        height=400,
+        margin=dict(l=20, r=120, t=40, b=20),
+        showlegend=True,
+        legend=dict(
+            yanchor="middle",
+            y=0.5,
+            xanchor="right",
+            x=1.1,
+            bgcolor='rgba(255, 255, 255, 0.8)',
+            bordercolor='rgba(0, 0, 0, 0.1)',
+            borderwidth=1
+        )
+    )
+
+# Client performance
+def build_client_performance_figure(client_data):
+    return go.Figure(data=[
+        go.Bar(
+            name='Transaction Volume',
+            x=client_data['Client'],
+            y=client_data['Volume']/1e9,
+            marker_color='rgba(26, 118, 255, 0.8)',
+            hovertemplate=(
+                "<b>%{x}</b><br>" +
+                "Volume: KES %{y:.2f}B<br>" +
+                "<extra></extra>"
+            )
+        ),
+        go.Scatter(
+            name='Transactions Count',
+            x=client_data['Client'],
+            y=client_data['Transactions'],
+            mode='lines+markers',
+            marker=dict(size=8),
+            yaxis='y2',
+            hovertemplate=(
+                "<b>%{x}</b><br>" +
+                "Transactions: %{y:,.0f}<br>" +
+                "<extra></extra>"
+            )
+        )
+    ]).update_layout(
+        title='Client Performance Metrics',
+        yaxis=dict(
+            title='Volume (KES Billions)',
+            titlefont=dict(color='rgba(26, 118, 255, 0.8)'),
+            tickfont=dict(color='rgba(26, 118, 255, 0.8)'),
+            type='log',
+            exponentformat='none',
+            tickformat='.2f'
+        ),
+        yaxis2=dict(
+            title='Number of Transactions',
+            titlefont=dict(color='rgba(255, 128, 0, 0.8)'),
+            tickfont=dict(color='rgba(255, 128, 0, 0.8)'),
+            overlaying='y',
+            side='right',
+            type='log',
+            exponentformat='none'
+        ),
+        height=400,
+        margin=dict(l=50, r=50, t=50, b=100),
+        legend=dict(
+            orientation="h",
+            y=1.1,
+            x=0.5,
+            xanchor='center'
+        ),
+        xaxis_tickangle=-45,
+        hovermode='x unified'
+    )
@@ -0,0 +1,321 @@
+# Geographic aggregates and maps
+#
+# Precomputes corridor aggregates (sender country -> KEN recipient region ->
+# city) once per data load and builds the drill-down map figures from them.
+# Country geometries come from assets/topojson/world_110m.json, a simplified
+# Natural Earth 1:110m topology in plotly's topojson layout, so neither the
+# browser nor report rendering fetches map data from the network. Recipient
+# regions and cities are drawn as proportional symbols at fixed coordinates.
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+import aggregates
+
+TOPOJSON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'topojson')
+CORRIDOR_DATA = os.environ.get('CORRIDOR_DATA')
+
+RECIPIENT_COUNTRY = 'KEN'
+UNKNOWN = 'Unknown'
+
+# Kenyan regions (former provinces) and their main cities: (lat, lon)
+KENYA_REGIONS = {
+    'Nairobi': (-1.2864, 36.8172),
+    'Central': (-0.5500, 36.9500),
+    'Coast': (-2.8000, 39.4000),
+    'Eastern': (0.6000, 38.4000),
+    'North Eastern': (1.8000, 40.1000),
+    'Nyanza': (-0.6000, 34.6000),
+    'Rift Valley': (0.5000, 36.0000),
+    'Western': (0.5500, 34.6000)
+}
+KENYA_CITIES = {
+    'Nairobi': ('Nairobi', -1.2864, 36.8172),
+    'Thika': ('Central', -1.0333, 37.0693),
+    'Nyeri': ('Central', -0.4201, 36.9476),
+    'Mombasa': ('Coast', -4.0435, 39.6682),
+    'Malindi': ('Coast', -3.2192, 40.1169),
+    'Machakos': ('Eastern', -1.5177, 37.2634),
+    'Meru': ('Eastern', 0.0470, 37.6498),
+    'Garissa': ('North Eastern', -0.4532, 39.6461),
+    'Kisumu': ('Nyanza', -0.0917, 34.7680),
+    'Kisii': ('Nyanza', -0.6817, 34.7667),
+    'Nakuru': ('Rift Valley', -0.3031, 36.0800),
+    'Eldoret': ('Rift Valley', 0.5143, 35.2698),
+    'Kakamega': ('Western', 0.2827, 34.7519),
+    'Bungoma': ('Western', 0.5635, 34.5606)
+}
+
+# Flow lines are grouped into a few width classes, one trace each, so the
+# number of traces stays constant however many corridors there are
+FLOW_WIDTHS = [1, 2, 3.5, 5]
+FLOW_COLOR = 'rgba(255, 128, 0, 0.6)'
+
+GEO_LAYOUT = dict(
+    showcoastlines=False,
+    showland=True,
+    landcolor='rgb(243, 243, 243)',
+    showcountries=True,
+    countrycolor='rgba(0, 0, 0, 0.25)',
+    showframe=False,
+    projection_type='natural earth'
+)
+KENYA_VIEW = dict(center=dict(lat=0.2, lon=37.9), projection_scale=9)
+CITY_ZOOM = 22
+
+
+@lru_cache(maxsize=None)
+def country_centroids():
+    # ISO-3 -> (lat, lon) of the main landmass, stored in the topology
+    with open(os.path.join(TOPOJSON_DIR, 'world_110m.json')) as f:
+        topology = json.load(f)
+    return {
+        geometry['id']: tuple(reversed(geometry['properties']['ct']))
+        for geometry in topology['objects']['countries']['geometries']
+    }
+
+
+def load_corridors(country_data, path=CORRIDOR_DATA):
+    """Corridor aggregate from ``path`` (CSV), or from ``country_data``.
+
+    Without a corridor export only sender countries are known, so every
+    corridor lands in the 'Unknown' recipient region and city.
+    """
+    if path:
+        raw = pd.read_csv(path)
+    else:
+        raw = {
+            'Sender_Country': country_data['Country'].astype(str),
+            'Recipient_Region': UNKNOWN,
+            'Recipient_City': UNKNOWN,
+            'Volume': country_data['Volume'],
+            'Count': country_data['Count']
+        }
+    return aggregates.load('corridor', raw)
+
+
+def _in_places(series, places):
+    # Categorical filter on integer codes: only the category labels are compared
+    wanted = np.flatnonzero(series.cat.categories.isin(list(places)))
+    return pd.Series(np.isin(series.cat.codes.to_numpy(), wanted), index=series.index)
+
+
+class GeoAggregates:
+    """Country, region and city rollups of the corridor aggregate."""
+
+    def __init__(self, corridors):
+        measures = ['Volume', 'Count']
+        self.country = corridors.groupby('Sender_Country', observed=True)[measures].sum().reset_index()
+        self.region = corridors.groupby(['Sender_Country', 'Recipient_Region'], observed=True)[measures].sum().reset_index()
+        self.city = corridors.groupby(['Sender_Country', 'Recipient_Region', 'Recipient_City'], observed=True)[measures].sum().reset_index()
+
+        centroids = country_centroids()
+        mapped = _in_places(self.country['Sender_Country'], centroids)
+        self.unmapped = self.country[~mapped].reset_index(drop=True)
+        self.country = self.country[mapped].reset_index(drop=True)
+        self.total_volume = corridors['Volume'].sum()
+
+        # A level can only be drilled into if it has something to place on the map
+        regions = self.region[_in_places(self.region['Recipient_Region'], KENYA_REGIONS)]
+        cities = self.city[_in_places(self.city['Recipient_City'], KENYA_CITIES)]
+        self.drillable = {str(country): set() for country in regions['Sender_Country'].unique()}
+        pairs = cities[['Sender_Country', 'Recipient_Region']].drop_duplicates()
+        for country, region in zip(pairs['Sender_Country'], pairs['Recipient_Region']):
+            if str(country) in self.drillable:
+                self.drillable[str(country)].add(str(region))
+
+        # The world view is the default figure, so build its flow traces up front
+        senders = self.country[self.country['Sender_Country'] != RECIPIENT_COUNTRY]
+        lat, lon = zip(*(centroids[c] for c in senders['Sender_Country'].astype(str))) if len(senders) else ((), ())
+        self.country_flows = flow_traces(lat, lon, *KENYA_REGIONS['Nairobi'], senders['Volume'])
+
+    def regions_for(self, country):
+        return self.region[self.region['Sender_Country'] == country]
+
+    def cities_for(self, country, region):
+        return self.city[(self.city['Sender_Country'] == country) & (self.city['Recipient_Region'] == region)]
+
+
+def flow_traces(lat, lon, dest_lat, dest_lon, volume):
+    volume = np.asarray(volume, dtype='float64')
+    lat, lon = np.asarray(lat, dtype='float64'), np.asarray(lon, dtype='float64')
+    dest_lat = np.broadcast_to(np.asarray(dest_lat, dtype='float64'), lat.shape)
+    dest_lon = np.broadcast_to(np.asarray(dest_lon, dtype='float64'), lon.shape)
+
+    # Log-spaced width classes; a corridor into itself has no line to draw
+    visible = (volume > 0) & ((lat != dest_lat) | (lon != dest_lon))
+    if not visible.any():
+        return []
+    log_volume = np.log10(volume[visible])
+    edges = np.linspace(log_volume.min(), log_volume.max(), len(FLOW_WIDTHS) + 1)[1:-1]
+    classes = np.digitize(log_volume, edges)
+
+    traces = []
+    for width_class, width in enumerate(FLOW_WIDTHS):
+        selected = classes == width_class
+        if not selected.any():
+            continue
+        # [origin, destination, gap] per corridor; NaN becomes null, which breaks the line
+        gap = np.full(selected.sum(), np.nan)
+        traces.append(go.Scattergeo(
+            lat=np.column_stack([lat[visible][selected], dest_lat[visible][selected], gap]).ravel(),
+            lon=np.column_stack([lon[visible][selected], dest_lon[visible][selected], gap]).ravel(),
+            mode='lines',
+            line=dict(width=width, color=FLOW_COLOR),
+            hoverinfo='skip',
+            showlegend=False
+        ))
+    return traces
+
+
+def _bubbles(names, lat, lon, frame, level):
+    # Marker area, not diameter, is proportional to volume
+    sizes = frame['Volume'].to_numpy('float64')
+    return go.Scattergeo(
+        lat=lat,
+        lon=lon,
+        text=names,
+        customdata=list(zip(names, frame['Volume'], frame['Count'])),
+        mode='markers+text',
+        textposition='top center',
+        marker=dict(
+            size=sizes,
+            sizemode='area',
+            sizeref=2 * sizes.max() / 40 ** 2 if sizes.max() else 1,
+            sizemin=4,
+            color='rgba(26, 118, 255, 0.8)',
+            line=dict(color='white', width=1)
+        ),
+        hovertemplate=(
+            f"<b>%{{customdata[0]}}</b> ({level})<br>" +
+            "Volume: KES %{customdata[1]:,.2f}<br>" +
+            "Transactions: %{customdata[2]:,}<br>" +
+            "<extra></extra>"
+        ),
+        showlegend=False
+    )
+
+
+def _place_frame(frame, column, places):
+    # Unknown and unlisted places cannot be drawn; they are reported instead
+    placed = _in_places(frame[column], places)
+    return frame[placed], frame[~placed]
+
+
+def build_geo_figure(geo_aggregates, country=None, region=None):
+    if country is None:
+        fig = _world_figure(geo_aggregates)
+    elif region is None:
+        fig = _region_figure(geo_aggregates, country)
+    else:
+        fig = _city_figure(geo_aggregates, country, region)
+    return fig.update_layout(
+        height=400,
+        margin=dict(l=10, r=10, t=40, b=10),
+        clickmode='event',
+        showlegend=False
+    )
+
+
+def _world_figure(geo_aggregates):
+    country = geo_aggregates.country
+    names = country['Sender_Country'].astype(str)
+    fig = go.Figure(go.Choropleth(
+        locations=names,
+        z=country['Volume'],
+        customdata=list(zip(names, country['Count'])),
+        colorscale='Blues',
+        marker_line_color='white',
+        colorbar=dict(title='KES', thickness=12),
+        hovertemplate=(
+            "<b>%{location}</b><br>" +
+            "Volume: KES %{z:,.2f}<br>" +
+            "Transactions: %{customdata[1]:,}<br>" +
+            "<extra></extra>"
+        )
+    ))
+    fig.add_traces(geo_aggregates.country_flows)
+    return fig.update_geos(**GEO_LAYOUT).update_layout(
+        title={'text': 'Transaction Volume by Sender Country', 'y': 0.97}
+    )
+
+
+def _region_figure(geo_aggregates, country):
+    placed, _ = _place_frame(geo_aggregates.regions_for(country), 'Recipient_Region', KENYA_REGIONS)
+    names = placed['Recipient_Region'].astype(str).tolist()
+    lat, lon = zip(*(KENYA_REGIONS[n] for n in names)) if names else ((), ())
+
+    fig = go.Figure(go.Choropleth(
+        locations=[RECIPIENT_COUNTRY],
+        z=[1],
+        colorscale=[[0, 'rgba(66, 133, 244, 0.15)'], [1, 'rgba(66, 133, 244, 0.15)']],
+        showscale=False,
+        hoverinfo='skip'
+    ))
+    if names:
+        origin_lat, origin_lon = country_centroids().get(country, (np.nan, np.nan))
+        fig.add_traces(flow_traces(lat, lon, origin_lat, origin_lon, placed['Volume']))
+        fig.add_trace(_bubbles(names, lat, lon, placed, 'region'))
+    return fig.update_geos(**GEO_LAYOUT).update_geos(**KENYA_VIEW).update_layout(
+        title={'text': f'{country} → KEN by Recipient Region', 'y': 0.97}
+    )
+
+
+def _city_figure(geo_aggregates, country, region):
+    placed, _ = _place_frame(geo_aggregates.cities_for(country, region), 'Recipient_City', KENYA_CITIES)
+    names = placed['Recipient_City'].astype(str).tolist()
+    lat = [KENYA_CITIES[n][1] for n in names]
+    lon = [KENYA_CITIES[n][2] for n in names]
+
+    fig = go.Figure()
+    if names:
+        fig.add_trace(_bubbles(names, lat, lon, placed, 'city'))
+    center_lat, center_lon = KENYA_REGIONS.get(region, KENYA_VIEW['center'].values())
+    return fig.update_geos(**GEO_LAYOUT).update_geos(
+        center=dict(lat=center_lat, lon=center_lon),
+        projection_scale=CITY_ZOOM
+    ).update_layout(
+        title={'text': f'{country} → {region} by Recipient City', 'y': 0.97}
+    )
+
+
+def unplaced_volume(geo_aggregates, country=None, region=None):
+    """Volume in the current view that cannot be placed on the map."""
+    if country is None:
+        return geo_aggregates.unmapped['Volume'].sum()
+    if region is None:
+        frame = geo_aggregates.regions_for(country)
+        return _place_frame(frame, 'Recipient_Region', KENYA_REGIONS)[1]['Volume'].sum()
+    frame = geo_aggregates.cities_for(country, region)
+    return _place_frame(frame, 'Recipient_City', KENYA_CITIES)[1]['Volume'].sum()
+
+
+def drill_down(geo_aggregates, drill, click_data):
+    """Next drill state after a click on the map.
+
+    Clicks on places with nothing to show at the next level are ignored.
+    """
+    drill = dict(drill or {})
+    if not click_data or 'region' in drill:
+        return drill
+    point = click_data['points'][0]
+    if 'country' in drill:
+        # Only the region bubbles carry customdata; the KEN outline does not
+        if point.get('customdata') and point['customdata'][0] in geo_aggregates.drillable.get(drill['country'], ()):
+            drill['region'] = point['customdata'][0]
+    elif point.get('location') in geo_aggregates.drillable:
+        drill['country'] = point['location']
+    return drill
+
+
+def drill_up(drill):
+    drill = dict(drill or {})
+    for level in ('region', 'country'):
+        if level in drill:
+            del drill[level]
+            break
+    return drill
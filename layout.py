@@ -0,0 +1,369 @@
+# Dashboard layout
+import dash_bootstrap_components as dbc
+from dash import dcc, html
+
+import cohorts
+from data import (
+    SUCCESS_RATE,
+    client_data,
+    cohort_engine,
+    failure_data,
+    geo_aggregates,
+    hourly_data,
+    monthly_data
+)
+from figures import (
+    build_client_performance_figure,
+    build_client_share_figure,
+    build_failure_figure,
+    build_geo_view,
+    build_hourly_figure,
+    build_monthly_figure,
+    build_success_gauge,
+    build_user_activity_figure
+)
+
+# Client logos mapping
+CLIENT_LOGOS = {
+    'Lemfi': 'assets/LEMFI.png',
+    'DLocal': 'assets/DLocal.png',
+    'Nala': 'assets/Nala.png',
+    'Wapipay': 'assets/wapipay.jpg'
+}
+
+def build_layout(app):
+    # Initial geographic view (no drill-down)
+    geo_figure, geo_breadcrumb, geo_unplaced = build_geo_view(geo_aggregates, {})
+    # Drill-down controls only when the corridor data has regions to drill into
+    geo_controls = [
+        dcc.Store(id='geo-drill', data={}),
+        dbc.Button(
+            "Back",
+            id='geo-back',
+            size='sm',
+            color='secondary',
+            outline=True,
+            className='me-2'
+        )
+    ] if geo_aggregates.drillable else []
+    # Remitter retention needs a transfer ledger; without one the card is left out
+    cohort_rows = [build_cohort_row(cohort_engine)] if cohort_engine is not None else []
+
+    return dbc.Container([
+        dbc.Row([
+            dbc.Col([
+                html.Div([
+                    html.Img(
+                        src='assets/vngrd.PNG',
+                        style={
+                            'height': '150px',
+                            'objectFit': 'contain',
+                            'marginBottom': '20px'
+                        }
+                    ),
+                    html.H1(
+                        "2024 Annual Bank Transfer Analysis", 
+                        className="text-primary text-center",
+                        style={
+                            'letterSpacing': '2px',
+                            'marginTop': '20px'
+                        }
+                    )
+                ], className="text-center")
+            ])
+        ], className="mb-4"),
+
+        # Key Metrics Cards
+        dbc.Row([
+            # Total Transactions Card
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardBody([
+                        html.H5("Total Annual Transactions", className="card-title text-center"),
+                        html.H2(
+                            f"{monthly_data['Transactions'].sum():,.0f}", 
+                            className="text-primary text-center"
+                        ),
+                        html.P([
+                            html.Span("Monthly Average: ", className="regular-text"),
+                            html.Span(
+                                f"{monthly_data['Transactions'].mean():,.0f}",
+                                className="regular-text text-success"
+                            )
+                        ], className="text-center")
+                    ])
+                ], className="shadow-sm h-100")
+            ]),
+        
+            # Success Rate Card
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardBody([
+                        html.H5("Average Success Rate", className="card-title text-center"),
+                        html.H2([
+                            f"{SUCCESS_RATE:.2f}",
+                            html.Small("%", className="text-muted")
+                        ], className="text-primary text-center"),
+                        html.P([
+                            html.Span("Peak: ", className="regular-text"),
+                            html.Span(
+                                f"{monthly_data['Success_Rate'].max():.1f}%",
+                                className="regular-text text-success"
+                            )
+                        ], className="text-center")
+                    ])
+                ], className="shadow-sm h-100")
+            ]),
+        
+            # Total Volume Card
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardBody([
+                        html.H5("Total Volume (KES)", className="card-title text-center"),
+                        html.H2(
+                            f"{monthly_data['Volume'].sum()/1e9:.2f}B", 
+                            className="text-primary text-center"
+                        ),
+                        html.P([
+                            html.Span("Monthly Average: ", className="regular-text"),
+                            html.Span(
+                                f"KES {monthly_data['Volume'].mean()/1e6:,.0f}M",
+                                className="regular-text text-success"
+                            )
+                        ], className="text-center")
+                    ])
+                ], className="shadow-sm h-100")
+            ]),
+
+            # Total Unique Users Card
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardBody([
+                        html.H5("Total Unique Users", className="card-title text-center"),
+                        html.H2(
+                            f"42,574", 
+                            className="text-primary text-center"
+                        ),
+                        html.P([
+                            html.Span("Monthly Growth Rate: ", className="regular-text"),
+                            html.Span(
+                                f"189.92%",
+                                className="regular-text text-success"
+                            )
+                        ], className="text-center")
+                    ])
+                ], className="shadow-sm h-100")
+            ])
+        ], className="mb-4 g-3"),
+
+        # Monthly Transaction Analysis
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Monthly Transaction Analysis"),
+                    dbc.CardBody([
+                        dcc.Graph(
+                            figure=build_monthly_figure(monthly_data),
+                            config={
+                                'displayModeBar': False
+                            }
+                        )
+                    ], style={'paddingBottom': '40px'})  
+                ], className="shadow-sm")
+            ], width=12)
+        ], className="mb-4"),
+
+        # Success Rate Gauge and User Activity Metrics
+        dbc.Row([
+            # Success Rate Gauge
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Success Rate Performance"),
+                    dbc.CardBody([
+                        dcc.Graph(
+                            figure=build_success_gauge(SUCCESS_RATE)
+                        )
+                    ])
+                ], className="shadow-sm")
+            ], width=4),
+
+            # User Activity Metrics
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("User Activity Metrics"),
+                    dbc.CardBody([
+                        dcc.Graph(
+                            figure=build_user_activity_figure(monthly_data)
+                        )
+                    ])
+                ], className="shadow-sm")
+            ], width=8)
+        ], className="mb-4"),
+
+        # Geographic Distribution and Failure Analysis
+        dbc.Row([
+            # Geographic Distribution
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Geographic Distribution"),
+                    dbc.CardBody([
+                        html.Div(geo_controls + [
+                            html.Span(
+                                geo_breadcrumb,
+                                id='geo-breadcrumb',
+                                className='regular-text text-muted'
+                            )
+                        ], className='mb-2'),
+                        dcc.Graph(
+                            id='geo-map',
+                            figure=geo_figure,
+                            config={
+                                'topojsonURL': app.get_asset_url('topojson/')
+                            }
+                        ),
+                        html.Div([
+                            html.P([
+                                "Not shown on map: ",
+                                html.Span(
+                                    geo_unplaced,
+                                    id='geo-unplaced',
+                                    className="text-muted"
+                                )
+                            ], className="mb-0 mt-3 regular-text text-center")
+                        ])
+                    ])
+                ], className="shadow-sm")
+            ], width=6),
+
+            # Failure Analysis
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Failure Analysis"),
+                    dbc.CardBody([
+                        dcc.Graph(
+                            figure=build_failure_figure(failure_data)
+                        ),
+                        html.Div([
+                            html.P([
+                                "Total Failed Transactions: ",
+                                html.Span(
+                                    f"{failure_data['Total'].sum():,}",
+                                    className="text-danger"
+                                )
+                            ], className="mb-0 mt-3 regular-text text-center")
+                        ])
+                    ])
+                ], className="shadow-sm")
+            ], width=6)
+        ], className="mb-4"),
+
+        # Hourly Transaction Pattern
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Hourly Transaction Pattern"),
+                    dbc.CardBody([
+                        dcc.Graph(
+                            figure=build_hourly_figure(hourly_data)
+                        ),
+                        html.Div([
+                            html.P([
+                                "Peak Volume Hour: ",
+                                html.Span(
+                                    "1:30 PM",
+                                    className="text-success"
+                                ),
+                                html.Span(
+                                    f" ({hourly_data['Count'].max():,} transactions, KES {hourly_data['Volume'].max()/1e6:.1f}M)",
+                                    className="text-muted"
+                                )
+                            ], className="mb-0 mt-3 regular-text text-center")
+                        ])
+                    ])
+                ], className="shadow-sm")
+            ], width=12)
+        ], className="mb-4"),
+
+        # Client Analysis
+        dbc.Row([
+            # Client Market Share
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Client Market Share"),
+                    dbc.CardBody([
+                        dcc.Graph(
+                            figure=build_client_share_figure(client_data)
+                        ),
+                        # Client Logos Section
+                        html.Div([
+                            html.Div([
+                                html.Img(
+                                    src=logo_path,
+                                    className='client-logo',
+                                    title=client
+                                ) for client, logo_path in CLIENT_LOGOS.items()
+                            ], style={
+                                'display': 'flex',
+                                'justifyContent': 'center',
+                                'alignItems': 'center',
+                                'flexWrap': 'wrap',
+                                'gap': '10px',
+                                'marginTop': '20px'
+                            })
+                        ])
+                    ])
+                ], className="shadow-sm")
+            ], width=6),
+
+            # Client Performance
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Client Performance Analysis"),
+                    dbc.CardBody([
+                        dcc.Graph(
+                            figure=build_client_performance_figure(client_data)
+                        ),
+                        html.Div([
+                            html.P([
+                                "Leading Client: ",
+                                html.Span(
+                                    f"{client_data.iloc[0]['Client']} ",
+                                    className="text-success"
+                                ),
+                                html.Span(
+                                    f"(KES {client_data.iloc[0]['Volume']/1e9:.2f}B, {client_data.iloc[0]['Transactions']:,} transactions)",
+                                    className="text-muted"
+                                )
+                            ], className="mb-0 mt-3 regular-text text-center")
+                        ])
+                    ])
+                ], className="shadow-sm")
+            ], width=6)
+        ], className="mb-4")
+
+    ] + cohort_rows, fluid=True, className="p-4")
+
+
+# Remitter Retention
+def build_cohort_row(engine):
+    return dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardHeader("Remitter Retention by Cohort"),
+                dbc.CardBody([
+                    dcc.Dropdown(
+                        id='cohort-client',
+                        options=[cohorts.ALL_CLIENTS] + engine.clients,
+                        value=cohorts.ALL_CLIENTS,
+                        clearable=False,
+                        className='regular-text mb-2',
+                        style={'maxWidth': '300px'}
+                    ),
+                    dcc.Graph(
+                        id='cohort-heatmap',
+                        figure=cohorts.build_retention_figure(engine)
+                    )
+                ])
+            ], className="shadow-sm")
+        ], width=12)
+    ], className="mb-4")
@@ -0,0 +1,510 @@
+# Load testing
+#
+# Simulates concurrent dashboard viewers against a local gunicorn serving
+# `server`, once per worker class, and prints a comparison. Each viewer
+# session loads the page, layout, dependencies and assets (including the map
+# topology plotly.js fetches), revalidating with ETag/Last-Modified on repeat
+# visits as a browser cache would, then interacts the
+# way a viewer does, with think time in between: it picks dropdown options,
+# clicks buttons and clicks points of the current map, and follows the
+# callbacks those updates trigger (e.g. a drill-down, then the redrawn map).
+# Worker CPU and RSS are sampled from /proc, so run it on Linux (as on
+# Render). Async worker classes need their library installed
+# (`pip install gevent`); unavailable classes are skipped.
+#
+#     python loadtest.py --users 50 --duration 60
+#     python loadtest.py --worker-classes sync gthread --workers 2 --threads 8
+#     python loadtest.py --url http://127.0.0.1:8080 --users 20   # existing server
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+HEALTH_PATH = '/healthz'
+ASYNC_WORKER_MODULES = {'gevent': 'gevent', 'eventlet': 'eventlet'}
+CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+# Callbacks triggered by other callbacks' outputs, followed per interaction
+MAX_CALLBACK_CHAIN = 3
+# Input properties a viewer changes directly; anything else (e.g. a Store) only
+# changes as the output of another callback
+INTERACTIVE_PROPS = ('value', 'n_clicks', 'clickData')
+
+
+# Gunicorn under test
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app, worker_class, workers, threads, port):
+    cmd = [
+        sys.executable, '-m', 'gunicorn', app,
+        '--bind', f'127.0.0.1:{port}',
+        '--workers', str(workers),
+        '--worker-class', worker_class,
+        '--log-level', 'warning'
+    ]
+    if worker_class == 'gthread':
+        cmd += ['--threads', str(threads)]
+    proc = subprocess.Popen(cmd)
+
+    # Lazy apps report ready once built; the first health check starts the
+    # build, so keep polling until every worker is likely to have answered ready
+    deadline = time.monotonic() + 60
+    consecutive = 0
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {proc.returncode} ({worker_class})")
+        try:
+            consecutive = consecutive + 1 if _health_ready(port) else 0
+        except OSError:
+            consecutive = 0
+        if consecutive >= workers * 3 and len(worker_pids(proc.pid)) >= workers:
+            return proc
+        time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError(f"gunicorn did not become ready within 60s ({worker_class})")
+
+
+def _health_ready(port):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    try:
+        conn.request('GET', HEALTH_PATH)
+        response = conn.getresponse()
+        body = response.read()
+    finally:
+        conn.close()
+    # Apps without a health endpoint count as ready as soon as they answer
+    if response.status == 404:
+        return True
+    return response.status == 200 and json.loads(body).get('ready', True)
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+# Worker resource sampling
+def worker_pids(master_pid):
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces; fields follow the last ')'
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == master_pid:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def _proc_sample(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    cpu_ticks = int(fields[11]) + int(fields[12])
+    rss = int(fields[21]) * PAGE_SIZE
+    return cpu_ticks, rss
+
+
+class WorkerSampler(threading.Thread):
+    """Samples CPU time and RSS of every gunicorn worker until stopped."""
+
+    def __init__(self, master_pid, interval=0.5):
+        super().__init__(daemon=True)
+        self.master_pid = master_pid
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self.first = {}
+        self.last = {}
+        self.peak_rss = defaultdict(int)
+
+    def run(self):
+        self.started = time.monotonic()
+        while True:
+            self._sample()
+            if self._stop_event.wait(self.interval):
+                break
+        self._sample()
+        self.elapsed = time.monotonic() - self.started
+
+    def _sample(self):
+        for pid in worker_pids(self.master_pid):
+            try:
+                ticks, rss = _proc_sample(pid)
+            except OSError:
+                continue
+            self.first.setdefault(pid, ticks)
+            self.last[pid] = ticks
+            self.peak_rss[pid] = max(self.peak_rss[pid], rss)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def summary(self):
+        rows = []
+        for pid in sorted(self.last):
+            cpu = (self.last[pid] - self.first[pid]) / CLK_TCK / self.elapsed * 100
+            rows.append((pid, cpu, self.peak_rss[pid] / 2**20))
+        return rows
+
+
+# Viewer sessions
+def _find_components(node, found):
+    if isinstance(node, dict):
+        props = node.get('props')
+        if isinstance(props, dict) and 'id' in props:
+            found[json.dumps(props['id'], sort_keys=True) if isinstance(props['id'], dict) else props['id']] = props
+        for value in node.values():
+            _find_components(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _find_components(value, found)
+    return found
+
+
+def _option_values(props):
+    values = []
+    for option in props.get('options') or []:
+        values.append(option.get('value') if isinstance(option, dict) else option)
+    return values
+
+
+def _click_data(figure, rng):
+    # A click on a random point of a clickable trace, shaped like plotly.js clickData
+    candidates = []
+    for curve, trace in enumerate((figure or {}).get('data', [])):
+        if trace.get('locations'):
+            candidates += [(curve, i, trace) for i in range(len(trace['locations']))]
+        elif trace.get('customdata') and 'markers' in (trace.get('mode') or ''):
+            candidates += [(curve, i, trace) for i in range(len(trace['customdata']))]
+    if not candidates:
+        return None
+    curve, index, trace = rng.choice(candidates)
+    point = {'curveNumber': curve, 'pointNumber': index, 'pointIndex': index}
+    for key, name in [('locations', 'location'), ('z', 'z'), ('lat', 'lat'), ('lon', 'lon'), ('customdata', 'customdata')]:
+        if isinstance(trace.get(key), list):
+            point[name] = trace[key][index]
+    return {'points': [point]}
+
+
+def _parse_outputs(output):
+    def parse(spec):
+        component_id, prop = spec.rsplit('.', 1)
+        return {'id': component_id, 'property': prop}
+
+    if output.startswith('..'):
+        return [parse(spec) for spec in output[2:-2].split('...')]
+    return parse(output)
+
+
+def _topojson_asset(props):
+    # plotly.js fetches <topojsonURL><scope>_<resolution>m.json for geo maps
+    url = (props.get('config') or {}).get('topojsonURL')
+    figure_layout = (props.get('figure') or {}).get('layout') or {}
+    if not url or 'geo' not in figure_layout:
+        return None
+    geo = figure_layout['geo']
+    return f"{url}{geo.get('scope', 'world')}_{geo.get('resolution', 110)}m.json"
+
+
+class Scenario:
+    """What a viewer requests, discovered once from the running app."""
+
+    def __init__(self, conn):
+        self.page = self._get(conn, '/')
+        self.layout = json.loads(self._get(conn, '/_dash-layout'))
+        dependencies = json.loads(self._get(conn, '/_dash-dependencies'))
+
+        self.assets = re.findall(r'(?:src|href)="(/[^"]+)"', self.page.decode('utf-8'))
+        components = _find_components(self.layout, {})
+        for props in components.values():
+            src = props.get('src')
+            if isinstance(src, str) and src.startswith(('assets/', '/assets/')):
+                self.assets.append('/' + src.lstrip('/'))
+            topojson = _topojson_asset(props)
+            if topojson:
+                self.assets.append(topojson)
+        self.assets = sorted(set(self.assets))
+
+        # Pattern-matching and clientside callbacks never reach the server
+        self.callbacks = [
+            dep for dep in dependencies
+            if not dep.get('clientside_function')
+            and not any(i['id'].startswith('{') for i in dep['inputs'] + dep['state'])
+        ]
+        self.components = components
+        self.interactions = [
+            dep for dep in self.callbacks
+            if any(i['property'] in INTERACTIVE_PROPS for i in dep['inputs'])
+        ]
+
+    @staticmethod
+    def _get(conn, path):
+        conn.request('GET', path)
+        response = conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise RuntimeError(f"GET {path} returned {response.status}")
+        return body
+
+    def component_props(self, component_id, state):
+        # Initial layout props, overridden by what callbacks returned this visit
+        return {**self.components.get(component_id, {}), **state.get(component_id, {})}
+
+    def callback_payload(self, dep, rng, state, changed=None):
+        """Request body for ``dep``; ``changed`` is the input the viewer touched.
+
+        Without ``changed`` a random input is interacted with the way a viewer
+        would: a dropdown option is picked, a button clicked or a graph point
+        clicked. With it, the callback fires because an earlier one updated it.
+        """
+        def value(item, interact):
+            props = self.component_props(item['id'], state)
+            current = props.get(item['property'])
+            if not interact:
+                return current
+            if item['property'] == 'value' and _option_values(props):
+                return rng.choice(_option_values(props))
+            if item['property'] == 'n_clicks':
+                return (current or 0) + 1
+            if item['property'] == 'clickData':
+                return _click_data(props.get('figure'), rng)
+            return current
+
+        interacted = changed is None
+        changed = changed or rng.choice([i for i in dep['inputs'] if i['property'] in INTERACTIVE_PROPS])
+        inputs = [dict(i, value=value(i, interacted and i is changed)) for i in dep['inputs']]
+        if interacted:
+            # Keep the viewer's own change (click count, selection) for later requests
+            touched = inputs[dep['inputs'].index(changed)]
+            state.setdefault(changed['id'], {})[changed['property']] = touched['value']
+        return {
+            'output': dep['output'],
+            'outputs': _parse_outputs(dep['output']),
+            'inputs': inputs,
+            'state': [dict(s, value=value(s, False)) for s in dep['state']],
+            'changedPropIds': [f"{changed['id']}.{changed['property']}"]
+        }
+
+    def triggered_by(self, updates):
+        """Callbacks a browser would fire next, with the input that triggers each."""
+        chained = []
+        for dep in self.callbacks:
+            for item in dep['inputs']:
+                if item['property'] in updates.get(item['id'], {}):
+                    chained.append((dep, item))
+                    break
+        return chained
+
+
+def viewer_session(host, port, scenario, deadline, think_time, callbacks_per_visit, results, seed):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    # Like a browser cache: repeat visits revalidate what earlier ones received
+    validators = {}
+
+    def hit(kind, method, path, body=None):
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        if method == 'GET':
+            headers.update(validators.get(path, {}))
+        started = time.perf_counter()
+        body_out = b''
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            body_out = response.read()
+            ok = response.status < 400
+            if method == 'GET' and response.status == 200:
+                validators[path] = {
+                    header: response.getheader(source)
+                    for header, source in [('If-None-Match', 'ETag'), ('If-Modified-Since', 'Last-Modified')]
+                    if response.getheader(source)
+                }
+            if response.status == 304:
+                kind += ' 304'
+        except (OSError, http.client.HTTPException):
+            ok = False
+            conn.close()
+        results.append((kind, time.perf_counter() - started, ok))
+        return body_out if ok else b''
+
+    def think():
+        time.sleep(rng.uniform(0.5, 1.5) * think_time)
+
+    def run_callback(dep, state, changed=None, depth=0):
+        payload = scenario.callback_payload(dep, rng, state, changed)
+        body = hit('callback', 'POST', '/_dash-update-component', json.dumps(payload))
+        try:
+            updates = json.loads(body).get('response', {}) if body else {}
+        except ValueError:
+            updates = {}
+        for component_id, props in updates.items():
+            state.setdefault(component_id, {}).update(props)
+        # Follow the chain the browser would (e.g. drill state -> map), bounded
+        if depth < MAX_CALLBACK_CHAIN:
+            for next_dep, trigger in scenario.triggered_by(updates):
+                run_callback(next_dep, state, trigger, depth + 1)
+
+    while time.monotonic() < deadline:
+        hit('page', 'GET', '/')
+        hit('layout', 'GET', '/_dash-layout')
+        hit('dependencies', 'GET', '/_dash-dependencies')
+        for path in scenario.assets:
+            hit('asset', 'GET', path)
+        # Each visit starts from the initial layout
+        state = {}
+        for _ in range(callbacks_per_visit if scenario.interactions else 0):
+            if time.monotonic() >= deadline:
+                break
+            think()
+            run_callback(rng.choice(scenario.interactions), state)
+        think()
+    conn.close()
+
+
+def run_load(host, port, users, duration, think_time, callbacks_per_visit):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    scenario = Scenario(conn)
+    conn.close()
+    if not scenario.interactions:
+        print("WARNING: the app exposes no viewer callbacks (no CORRIDOR_DATA or LEDGER_DATA?); "
+              "sessions only load pages and assets, so results do not cover interaction",
+              file=sys.stderr)
+
+    results = []
+    deadline = time.monotonic() + duration
+    sessions = [
+        threading.Thread(
+            target=viewer_session,
+            args=(host, port, scenario, deadline, think_time, callbacks_per_visit, results, seed),
+            daemon=True
+        )
+        for seed in range(users)
+    ]
+    started = time.monotonic()
+    for session in sessions:
+        session.start()
+        # Ramp up instead of a thundering herd at t=0
+        time.sleep(min(0.05, think_time / max(users, 1)))
+    for session in sessions:
+        session.join()
+    return results, time.monotonic() - started
+
+
+# Reporting
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(results, elapsed):
+    by_kind = defaultdict(list)
+    for kind, latency, ok in results:
+        by_kind[kind].append((latency, ok))
+    by_kind['all'] = [(latency, ok) for _, latency, ok in results]
+
+    summary = {}
+    for kind, samples in by_kind.items():
+        latencies = sorted(latency for latency, _ in samples)
+        errors = sum(1 for _, ok in samples if not ok)
+        summary[kind] = {
+            'requests': len(samples),
+            'rps': len(samples) / elapsed if elapsed else 0.0,
+            'error_rate': errors / len(samples) if samples else 0.0,
+            'p50': percentile(latencies, 50) * 1000,
+            'p90': percentile(latencies, 90) * 1000,
+            'p99': percentile(latencies, 99) * 1000
+        }
+    return summary
+
+
+def print_report(label, summary, workers):
+    print(f"\n== {label}")
+    print(f"{'endpoint':<18}{'requests':>10}{'req/s':>10}{'errors':>9}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for kind in sorted(summary, key=lambda k: (k == 'all', k)):
+        row = summary[kind]
+        print(f"{kind:<18}{row['requests']:>10}{row['rps']:>10.1f}{row['error_rate']:>9.1%}"
+              f"{row['p50']:>10.1f}{row['p90']:>10.1f}{row['p99']:>10.1f}")
+    for pid, cpu, rss in workers:
+        print(f"worker {pid}: cpu {cpu:5.1f}%  peak rss {rss:6.1f} MiB")
+
+
+def print_comparison(runs):
+    print("\n== Comparison")
+    print(f"{'worker class':<14}{'req/s':>10}{'errors':>9}{'p50 ms':>10}{'p99 ms':>10}{'cpu %':>9}{'rss MiB':>10}")
+    for label, summary, workers in runs:
+        row = summary['all']
+        cpu = sum(w[1] for w in workers)
+        rss = sum(w[2] for w in workers)
+        print(f"{label:<14}{row['rps']:>10.1f}{row['error_rate']:>9.1%}"
+              f"{row['p50']:>10.1f}{row['p99']:>10.1f}{cpu:>9.1f}{rss:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent dashboard viewers.")
+    parser.add_argument('--app', default='app1:server', help="WSGI app for gunicorn")
+    parser.add_argument('--url', help="Test an already running server instead of starting gunicorn")
+    parser.add_argument('--worker-classes', nargs='+', default=['sync', 'gthread', 'gevent'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4, help="Threads per gthread worker")
+    parser.add_argument('--users', type=int, default=20, help="Concurrent viewer sessions")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds per run")
+    parser.add_argument('--think-time', type=float, default=2.0, help="Mean seconds between viewer actions")
+    parser.add_argument('--callbacks-per-visit', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.url:
+        target = urlsplit(args.url)
+        results, elapsed = run_load(target.hostname, target.port or 80, args.users, args.duration,
+                                    args.think_time, args.callbacks_per_visit)
+        print_report(args.url, summarize(results, elapsed), [])
+        return 0
+
+    runs = []
+    for worker_class in args.worker_classes:
+        module = ASYNC_WORKER_MODULES.get(worker_class)
+        if module and importlib.util.find_spec(module) is None:
+            print(f"Skipping {worker_class}: {module} is not installed")
+            continue
+        port = _free_port()
+        proc = start_server(args.app, worker_class, args.workers, args.threads, port)
+        sampler = WorkerSampler(proc.pid)
+        sampler.start()
+        try:
+            results, elapsed = run_load('127.0.0.1', port, args.users, args.duration,
+                                        args.think_time, args.callbacks_per_visit)
+        finally:
+            sampler.stop()
+            stop_server(proc)
+        runs.append((worker_class, summarize(results, elapsed), sampler.summary()))
+        print_report(worker_class, *runs[-1][1:])
+
+    if len(runs) > 1:
+        print_comparison(runs)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,374 @@
+# Report generation
+#
+# Renders the "2024 Annual Bank Transfer Analysis" as PDF and Excel files per
+# client and per period, reusing the dashboard figure builders (figures.py). Rendering
+# happens in a small, low-priority process pool so a batch of tenant reports
+# never competes with the gunicorn workers serving the dashboard. Identical
+# requests are coalesced and finished files are cached on disk per data
+# version, so re-running the monthly job only renders what changed.
+#
+# The monthly job (see render.yaml) runs on a container whose filesystem is
+# discarded afterwards, so it emails the finished files to Finance
+# (REPORT_MAIL_TO, sent through SMTP_HOST) rather than relying on REPORT_DIR.
+#
+#     python reports.py --previous-month
+#     python reports.py --clients Lemfi Nala --months 2024-10 2024-11 --formats pdf
+import argparse
+import datetime
+import hashlib
+import io
+import mimetypes
+import os
+import pathlib
+import smtplib
+import ssl
+import threading
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from email.message import EmailMessage
+
+import aggregates
+import cohorts
+import geo
+
+REPORT_DIR = os.environ.get('REPORT_DIR', 'reports')
+REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', 2))
+REPORT_MAX_PENDING = int(os.environ.get('REPORT_MAX_PENDING', 16))
+REPORT_FORMATS = ('pdf', 'xlsx')
+
+# Delivery; reports are only emailed when REPORT_MAIL_TO is set
+REPORT_MAIL_TO = os.environ.get('REPORT_MAIL_TO', '')
+REPORT_MAIL_FROM = os.environ.get('REPORT_MAIL_FROM', 'reports@localhost')
+SMTP_HOST = os.environ.get('SMTP_HOST', 'localhost')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', 587))
+SMTP_USER = os.environ.get('SMTP_USER')
+SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD')
+# Reports hold client financials: STARTTLS unless explicitly disabled
+SMTP_STARTTLS = os.environ.get('SMTP_STARTTLS', '1') != '0'
+
+# Image size used for every rendered figure
+FIGURE_WIDTH = 1100
+FIGURE_HEIGHT = 500
+
+# months are period keys such as '2024-09' (aggregates.month_key)
+ReportRequest = namedtuple('ReportRequest', ['client', 'months', 'fmt'])
+
+
+def report_key(request, version):
+    # Stable across processes, unlike hash()
+    raw = '|'.join([version, request.client or '', ','.join(request.months), request.fmt])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def report_path(request, version):
+    client = request.client or 'All_Clients'
+    if len(request.months) == 1:
+        period = request.months[0]
+    else:
+        period = f"{request.months[0]}_to_{request.months[-1]}"
+    name = f"{client}_{period}_{report_key(request, version)[:8]}.{request.fmt}"
+    return os.path.join(REPORT_DIR, version, name)
+
+
+# Report content
+def _report_frames(request):
+    import data
+
+    keys = aggregates.month_keys(data.monthly_data)
+    monthly = data.monthly_data[[key in request.months for key in keys]]
+    if monthly.empty:
+        raise ValueError(f"No monthly data for period {request.months!r}")
+    if request.client is not None and request.client not in set(data.client_data['Client']):
+        raise ValueError(f"Unknown client {request.client!r}")
+    return data, monthly.reset_index(drop=True)
+
+
+def _summary_rows(data, monthly, client):
+    success_rate = (monthly['Success_Rate'] * monthly['Transactions']).sum() / monthly['Transactions'].sum()
+    # Monthly aggregates are platform-wide, and unique counts are per month, so
+    # their sum counts a remitter once for every month they were active
+    rows = [
+        ('Period', period_label(aggregates.month_keys(monthly))),
+        ('Platform Transactions', f"{monthly['Transactions'].sum():,.0f}"),
+        ('Platform Volume (KES)', f"{monthly['Volume'].sum():,.2f}"),
+        ('Platform Success Rate', f"{success_rate:.2f}%"),
+        ('Platform Remitter-Months', f"{monthly['Unique_Remitters'].sum():,}"),
+        ('Platform Recipient-Months', f"{monthly['Unique_Recipients'].sum():,}"),
+    ]
+    if client is not None:
+        # Client aggregates are only available for the full year
+        row = data.client_data[data.client_data['Client'] == client].iloc[0]
+        rows += [
+            ('Client', client),
+            ('Client Annual Volume (KES)', f"{row['Volume']:,.2f}"),
+            ('Client Annual Transactions', f"{row['Transactions']:,}"),
+            ('Client Market Share', f"{row['Market_Share']:.2f}%"),
+        ]
+    return rows, success_rate
+
+
+def _report_figures(data, monthly, client, rows, success_rate):
+    import plotly.graph_objects as go
+
+    import figures
+
+    title = "2024 Annual Bank Transfer Analysis"
+    if client is not None:
+        title += f" - {client}"
+    summary = go.Figure(go.Table(
+        header=dict(values=['Metric', 'Value'], fill_color='#2C3E50', font=dict(color='white', size=14)),
+        cells=dict(values=[[r[0] for r in rows], [r[1] for r in rows]], height=30, font=dict(size=13))
+    )).update_layout(title={'text': title, 'x': 0.5}, margin=dict(l=40, r=40, t=80, b=40))
+
+    report_figures = [
+        summary,
+        figures.build_monthly_figure(monthly),
+        figures.build_success_gauge(round(success_rate, 2)),
+        figures.build_user_activity_figure(monthly),
+        figures.build_geo_view(data.geo_aggregates, {})[0],
+        figures.build_failure_figure(data.failure_data),
+        figures.build_hourly_figure(data.hourly_data),
+        figures.build_client_share_figure(data.client_data),
+        figures.build_client_performance_figure(data.client_data),
+    ]
+    engine = data.cohort_engine
+    if engine is not None and (client is None or client in engine.clients):
+        report_figures.append(cohorts.build_retention_figure(engine, client or cohorts.ALL_CLIENTS))
+    return report_figures
+
+
+def _figure_png(fig):
+    return fig.to_image(format='png', width=FIGURE_WIDTH, height=FIGURE_HEIGHT)
+
+
+def _write_pdf(path, figures):
+    from PIL import Image
+
+    pages = [Image.open(io.BytesIO(_figure_png(fig))).convert('RGB') for fig in figures]
+    pages[0].save(path, format='PDF', save_all=True, append_images=pages[1:], resolution=100)
+
+
+def _write_xlsx(path, figures, data, monthly, rows):
+    import pandas as pd
+    from openpyxl.drawing.image import Image
+
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        pd.DataFrame(rows, columns=['Metric', 'Value']).to_excel(writer, sheet_name='Summary', index=False)
+        monthly.to_excel(writer, sheet_name='Monthly', index=False)
+        data.client_data.to_excel(writer, sheet_name='Clients', index=False)
+        data.country_data.to_excel(writer, sheet_name='Countries', index=False)
+        data.failure_data.to_excel(writer, sheet_name='Failures', index=False)
+        hourly = data.hourly_data.assign(Hour=aggregates.hour_labels(data.hourly_data['Slot']))
+        hourly.to_excel(writer, sheet_name='Hourly', index=False)
+
+        charts = writer.book.create_sheet('Charts')
+        row = 1
+        for fig in figures[1:]:
+            image = Image(io.BytesIO(_figure_png(fig)))
+            charts.add_image(image, f"A{row}")
+            # Roughly 20px per spreadsheet row
+            row += FIGURE_HEIGHT // 20 + 2
+
+
+def render_report(request, path):
+    # Runs inside a pool worker
+    data, monthly = _report_frames(request)
+    rows, success_rate = _summary_rows(data, monthly, request.client)
+    figures = _report_figures(data, monthly, request.client, rows, success_rate)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    base, ext = os.path.splitext(path)
+    # Keep the extension so writers can infer the file type
+    tmp_path = f"{base}.{os.getpid()}.tmp{ext}"
+    if request.fmt == 'pdf':
+        _write_pdf(tmp_path, figures)
+    elif request.fmt == 'xlsx':
+        _write_xlsx(tmp_path, figures, data, monthly, rows)
+    else:
+        raise ValueError(f"Unsupported report format {request.fmt!r}")
+    # Atomic so readers never see a half-written artifact
+    os.replace(tmp_path, path)
+    return path
+
+
+def _init_worker():
+    import plotly.io as pio
+
+    # Maps render from the bundled topology, never the plotly CDN
+    pio.kaleido.scope.topojson = pathlib.Path(geo.TOPOJSON_DIR).as_uri() + '/'
+
+    # Lower priority than the web workers on the same host
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+
+
+def report_version():
+    """Cache version of rendered reports: the data and the code that renders it."""
+    import sys
+
+    import plotly
+
+    import data
+    import figures
+    from response_cache import code_version
+
+    sources = [sys.modules[__name__], aggregates, cohorts, data, figures, geo]
+    code = code_version(sources, extra=[plotly.__version__])
+    return f"{data.data_version()}-{code}"
+
+
+# Job queue
+class ReportQueue:
+    """Bounded report job queue backed by a process pool.
+
+    ``submit`` returns a future resolving to the artifact path. Cached
+    artifacts resolve immediately, identical in-flight requests share one
+    future, and submission blocks once ``max_pending`` jobs are queued.
+    """
+
+    def __init__(self, workers=REPORT_WORKERS, max_pending=REPORT_MAX_PENDING, version=None):
+        if version is None:
+            version = report_version()
+        self.version = version
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def submit(self, request):
+        if request.fmt not in REPORT_FORMATS:
+            raise ValueError(f"Unsupported report format {request.fmt!r}")
+        key = report_key(request, self.version)
+        path = report_path(request, self.version)
+
+        with self._lock:
+            if key in self._inflight:
+                return self._inflight[key]
+            if os.path.exists(path):
+                future = Future()
+                future.set_result(path)
+                return future
+
+        self._slots.acquire()
+        with self._lock:
+            # Another thread may have queued it while we waited for a slot
+            if key in self._inflight:
+                self._slots.release()
+                return self._inflight[key]
+            future = self._executor.submit(render_report, request, path)
+            self._inflight[key] = future
+        future.add_done_callback(lambda f, key=key: self._done(key))
+        return future
+
+    def _done(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+        self._slots.release()
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+def report_requests(clients, months, formats=REPORT_FORMATS):
+    months = tuple(months)
+    return [ReportRequest(client, months, fmt) for client in clients for fmt in formats]
+
+
+def previous_month(today=None):
+    """Period key of the calendar month before ``today``, e.g. '2026-09'."""
+    today = today or datetime.date.today()
+    last_day = today.replace(day=1) - datetime.timedelta(days=1)
+    return aggregates.month_key(last_day.year, aggregates.MONTHS[last_day.month - 1])
+
+
+def period_label(months):
+    first, last = aggregates.month_key_label(months[0]), aggregates.month_key_label(months[-1])
+    return first if first == last else f"{first} - {last}"
+
+
+def deliver(paths, recipients, period):
+    """Email the report files to ``recipients`` in a single message."""
+    message = EmailMessage()
+    message['Subject'] = f"Bank Transfer Analysis reports - {period}"
+    message['From'] = REPORT_MAIL_FROM
+    message['To'] = ', '.join(recipients)
+    message.set_content(f"Attached: {len(paths)} report(s) for {period}.\n")
+    for path in sorted(paths):
+        mime_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        maintype, subtype = mime_type.split('/')
+        with open(path, 'rb') as f:
+            message.add_attachment(f.read(), maintype=maintype, subtype=subtype, filename=os.path.basename(path))
+
+    with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=60) as smtp:
+        if SMTP_STARTTLS:
+            smtp.starttls(context=ssl.create_default_context())
+        if SMTP_USER:
+            smtp.login(SMTP_USER, SMTP_PASSWORD)
+        smtp.send_message(message)
+
+
+def main(argv=None):
+    import data
+
+    all_months = sorted(aggregates.month_keys(data.monthly_data))
+    all_clients = list(data.client_data['Client'])
+
+    parser = argparse.ArgumentParser(description="Generate per-client PDF/Excel dashboard reports.")
+    parser.add_argument('--clients', nargs='+', default=all_clients,
+                        help="Clients to report on (default: all)")
+    period = parser.add_mutually_exclusive_group()
+    period.add_argument('--months', nargs='+', default=all_months, choices=all_months, metavar='MONTH',
+                        help=f"Months in the report period, from {', '.join(all_months)} (default: all)")
+    period.add_argument('--previous-month', action='store_true',
+                        help="Report on the calendar month that just ended")
+    parser.add_argument('--formats', nargs='+', default=list(REPORT_FORMATS), choices=REPORT_FORMATS)
+    parser.add_argument('--workers', type=int, default=REPORT_WORKERS)
+    parser.add_argument('--mail-to', nargs='+', default=REPORT_MAIL_TO.split(',') if REPORT_MAIL_TO else [],
+                        help="Email the reports to these addresses (default: REPORT_MAIL_TO)")
+    args = parser.parse_args(argv)
+
+    if args.previous_month:
+        month = previous_month()
+        if month not in all_months:
+            # Nothing to report yet is not a failure of the scheduled job
+            print(f"No data for {aggregates.month_key_label(month)}; nothing to report")
+            return 0
+        args.months = [month]
+
+    # Keep the period in calendar order regardless of how it was given
+    months = [m for m in all_months if m in args.months]
+    requests = report_requests(args.clients, months, args.formats)
+
+    failed = 0
+    paths = []
+    with ReportQueue(workers=args.workers) as queue:
+        futures = {queue.submit(request): request for request in requests}
+        for future in as_completed(futures):
+            request = futures[future]
+            try:
+                paths.append(future.result())
+                print(paths[-1])
+            except Exception as exc:
+                failed += 1
+                print(f"FAILED {request.client} {request.fmt}: {exc}")
+
+    if args.mail_to and paths:
+        try:
+            deliver(paths, args.mail_to, period_label(months))
+            print(f"Sent {len(paths)} report(s) to {', '.join(args.mail_to)}")
+        except (OSError, smtplib.SMTPException) as exc:
+            failed += 1
+            print(f"FAILED delivery to {', '.join(args.mail_to)}: {exc}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
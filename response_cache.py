@@ -0,0 +1,231 @@
+# Response caching for the Dash endpoints
+#
+# The layout and dependency graph only change when the data (or the code that
+# builds them) changes, yet Dash re-serializes them for every visitor. This
+# module memoizes those responses per data and code version, answers conditional GETs
+# with 304, and optionally caches deterministic callback outputs. An on-disk
+# layer (RESPONSE_CACHE_DIR, one bounded subdirectory per version) lets
+# restarted workers skip the first serialization too.
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from email.utils import formatdate
+
+import flask
+
+RESPONSE_CACHE_DIR = os.environ.get('RESPONSE_CACHE_DIR')
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 512))
+RESPONSE_CACHE_DISK_SIZE = int(os.environ.get('RESPONSE_CACHE_DISK_SIZE', 2048))
+
+# Browsers must revalidate, but may keep the body and use 304s
+CACHE_CONTROL = 'no-cache'
+
+
+class ResponseCache:
+    """Bounded in-memory LRU of response bodies with an optional disk layer.
+
+    Disk entries live in one subdirectory per version (see ``use_version``);
+    older versions are removed and each directory is capped at
+    ``max_disk_entries`` files, least recently used first.
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE, cache_dir=RESPONSE_CACHE_DIR,
+                 max_disk_entries=RESPONSE_CACHE_DISK_SIZE):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.cache_dir = cache_dir
+        self.version_dir = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_entries = 0
+
+    def use_version(self, version):
+        """Serve entries for ``version`` only, dropping older disk versions."""
+        with self._lock:
+            self._entries.clear()
+        if not self.cache_dir:
+            return
+        self.version_dir = os.path.join(self.cache_dir, version)
+        os.makedirs(self.version_dir, exist_ok=True)
+        for name in os.listdir(self.cache_dir):
+            if name != version:
+                shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+        self._disk_entries = len(os.listdir(self.version_dir))
+
+    def _disk_path(self, key):
+        return os.path.join(self.version_dir, f"{key}.json")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        if self.version_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'rb') as f:
+                    body = f.read()
+                # mtime doubles as last use for pruning
+                os.utime(path)
+            except OSError:
+                return None
+            self._remember(key, body)
+            return body
+        return None
+
+    def set(self, key, body):
+        self._remember(key, body)
+        if self.version_dir:
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+            except OSError:
+                # The disk layer is an optimization; never fail the response for it
+                return
+            self._disk_entries += 1
+            if self._disk_entries > self.max_disk_entries:
+                self._prune_disk()
+
+    def _prune_disk(self):
+        # Other workers share the directory, so recount instead of trusting ours
+        entries = []
+        with os.scandir(self.version_dir) as it:
+            for entry in it:
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_disk_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._disk_entries = min(len(entries), self.max_disk_entries)
+
+    def _remember(self, key, body):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def code_version(modules, extra=()):
+    """Fingerprint of the source of ``modules`` (plus ``extra`` strings).
+
+    Mixed into the cache version so a deploy that changes the layout or
+    callbacks never serves responses cached by the previous code.
+    """
+    digest = hashlib.sha1()
+    # Keyed by file name, so a module run as __main__ hashes the same as imported
+    for path in sorted((module.__file__ for module in modules), key=os.path.basename):
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    for value in extra:
+        digest.update(str(value).encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def _callback_items(items):
+    # Only what Dash passes to the callback; wildcard inputs arrive as lists
+    if isinstance(items, list):
+        return [_callback_items(item) for item in items]
+    if isinstance(items, dict):
+        return [items.get('id'), items.get('property'), items.get('value')]
+    return None
+
+
+def _callback_fingerprint(payload):
+    # Extra JSON keys are ignored by Dash, so they must not create new entries
+    return json.dumps([
+        payload.get('output'),
+        _callback_items(payload.get('inputs') or []),
+        _callback_items(payload.get('state') or []),
+        sorted(payload.get('changedPropIds') or [])
+    ], sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def _etag(version, body):
+    return f"{version}-{hashlib.sha1(body).hexdigest()[:12]}"
+
+
+def install_response_cache(app, version, last_modified, deterministic_outputs=(), cache=None):
+    """Serve the Dash layout, dependencies and selected callbacks from cache.
+
+    ``version`` is mixed into every cache key and ETag; it must change with
+    both the data and the code that renders it (see ``code_version``).
+    ``last_modified`` is a POSIX timestamp for Last-Modified headers.
+    ``deterministic_outputs`` lists callback output ids (as Dash reports them
+    in the request body) whose result depends only on their inputs.
+    """
+    cache = cache or ResponseCache()
+    cache.use_version(version)
+    prefix = app.config.routes_pathname_prefix
+    static_paths = {f"{prefix}_dash-layout", f"{prefix}_dash-dependencies"}
+    callback_path = f"{prefix}_dash-update-component"
+    deterministic_outputs = set(deterministic_outputs)
+    last_modified_header = formatdate(last_modified, usegmt=True)
+
+    def _cache_key():
+        request = flask.request
+        if request.method == 'GET' and request.path in static_paths:
+            raw = request.path.encode('utf-8')
+        elif request.method == 'POST' and request.path == callback_path and deterministic_outputs:
+            payload = request.get_json(silent=True) or {}
+            if not isinstance(payload, dict) or payload.get('output') not in deterministic_outputs:
+                return None
+            raw = _callback_fingerprint(payload)
+        else:
+            return None
+        return hashlib.sha1(raw).hexdigest()
+
+    def _not_modified(etag):
+        request = flask.request
+        if request.if_none_match:
+            return request.if_none_match.contains(etag)
+        if request.method == 'GET' and request.if_modified_since:
+            return request.if_modified_since.timestamp() >= int(last_modified)
+        return False
+
+    def _decorate(response, etag):
+        response.set_etag(etag)
+        response.headers['Last-Modified'] = last_modified_header
+        response.headers['Cache-Control'] = CACHE_CONTROL
+        return response
+
+    @app.server.before_request
+    def _serve_from_cache():
+        key = _cache_key()
+        flask.g.response_cache_key = key
+        if key is None:
+            return None
+        body = cache.get(key)
+        if body is None:
+            return None
+        flask.g.response_cache_key = None
+        etag = _etag(version, body)
+        if _not_modified(etag):
+            return _decorate(flask.Response(status=304), etag)
+        return _decorate(flask.Response(body, mimetype='application/json'), etag)
+
+    @app.server.after_request
+    def _store_in_cache(response):
+        key = flask.g.pop('response_cache_key', None)
+        if key is None or response.status_code != 200 or response.direct_passthrough:
+            return response
+        body = response.get_data()
+        cache.set(key, body)
+        etag = _etag(version, body)
+        if _not_modified(etag):
+            return _decorate(flask.Response(status=304), etag)
+        return _decorate(response, etag)
+
+    return cache
@@ -0,0 +1,127 @@
+# Startup profiling
+#
+# `timed` records how long the deferred parts of startup take (TIMINGS).
+# Run as a script, this prints a cold-start report from a fresh interpreter:
+# import time per top-level package (python -X importtime), time to the first
+# health check, the deferred dashboard build and the first layout requests.
+#
+#     python startup.py
+#     python startup.py --top 20
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+TIMINGS = {}
+
+# A health check must answer well within this on a fresh worker
+HEALTH_TARGET = 1.0
+
+
+@contextlib.contextmanager
+def timed(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        TIMINGS[name] = time.perf_counter() - started
+
+
+# Runs in the child interpreter; plain WSGI calls keep test clients out of the numbers
+PROBE = '''
+import io, json, sys, time
+from wsgiref.util import setup_testing_defaults
+
+def get(app, path):
+    environ = {'PATH_INFO': path, 'wsgi.input': io.BytesIO()}
+    setup_testing_defaults(environ)
+    status = []
+    started = time.perf_counter()
+    body = b''.join(app(environ, lambda s, h, exc_info=None: status.append(s)))
+    return time.perf_counter() - started, status[0], len(body)
+
+started = time.perf_counter()
+import app1
+timings = {'import_app1': time.perf_counter() - started}
+timings['health'], health_status, _ = get(app1.server, app1.HEALTH_PATH)
+timings['ready_for_health'] = time.perf_counter() - started
+timings['first_page'], page_status, _ = get(app1.server, '/')
+timings['first_layout'], layout_status, size = get(app1.server, '/_dash-layout')
+timings['cached_layout'], _, _ = get(app1.server, '/_dash-layout')
+
+import startup
+timings.update(startup.TIMINGS)
+print(json.dumps({
+    'timings': timings,
+    'status': [health_status, page_status, layout_status],
+    'layout_bytes': size
+}))
+'''
+
+
+def import_breakdown(stderr):
+    # "import time: self [us] | cumulative | imported package"
+    by_package = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        by_package[name.strip().split('.')[0]] += int(self_us)
+    return sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+
+
+def profile():
+    # No warm-up thread, so first_page measures the whole deferred build
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env={**os.environ, 'APP_WARMUP': '0'}
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup probe failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    return result, import_breakdown(proc.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start profile of the dashboard.")
+    parser.add_argument('--top', type=int, default=12, help="Packages to list in the import breakdown")
+    args = parser.parse_args(argv)
+
+    result, packages = profile()
+    timings = result['timings']
+
+    total_us = sum(us for _, us in packages)
+    print(f"Import time by package (total {total_us / 1e6:.2f}s)")
+    for name, us in packages[:args.top]:
+        print(f"  {name:<28}{us / 1000:>9.1f} ms  {us / total_us:>6.1%}")
+
+    print("\nStartup phases")
+    phases = [
+        ('import_app1', "import app1"),
+        ('health', "first health check"),
+        ('ready_for_health', "import + health answered"),
+        ('app_build', "deferred dashboard build"),
+        ('layout_build', "  of which layout build"),
+        ('first_page', "first page request (incl. build)"),
+        ('first_layout', "first _dash-layout"),
+        ('cached_layout', "cached _dash-layout")
+    ]
+    for key, label in phases:
+        if key in timings:
+            print(f"  {label:<36}{timings[key] * 1000:>9.1f} ms")
+    print(f"  {'layout size':<36}{result['layout_bytes'] / 1024:>9.1f} KiB")
+
+    ok = timings['ready_for_health'] < HEALTH_TARGET
+    print(f"\nHealth check target {HEALTH_TARGET * 1000:.0f} ms: {'PASS' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cohorts  # noqa: E402
+
+
+def _synthetic_ledger(rows=20000, seed=7):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Client': rng.choice(['Lemfi', 'DLocal', 'Nala', 'Wapipay'], rows),
+        'Remitter_ID': rng.integers(0, 3000, rows).astype(str),
+        'Date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D')
+    })
+
+
+def _naive_retention(ledger, months):
+    # Plain set arithmetic over (remitter, month) pairs
+    month = ledger['Date'].dt.to_period('M')
+    first = month.groupby(ledger['Remitter_ID']).transform('min')
+    periods = list(pd.period_range(month.min(), month.max(), freq='M'))
+    assert len(periods) == months
+
+    sizes = np.zeros(months, dtype='int64')
+    retained = np.full((months, months), np.nan)
+    for c, cohort_month in enumerate(periods):
+        cohort = set(ledger['Remitter_ID'][first == cohort_month])
+        sizes[c] = len(cohort)
+        if not cohort:
+            continue
+        for m in range(c, months):
+            retained[c, m] = len(cohort & set(ledger['Remitter_ID'][month == periods[m]]))
+    return sizes, retained
+
+
+def test_retention_matches_naive_computation():
+    ledger = _synthetic_ledger()
+    engine = cohorts.CohortEngine(ledger)
+    assert engine.clients == sorted(ledger['Client'].unique())
+
+    for client in [cohorts.ALL_CLIENTS] + engine.clients:
+        subset = ledger if client == cohorts.ALL_CLIENTS else ledger[ledger['Client'] == client]
+        sizes, retained = engine.retention(client)
+        expected_sizes, expected_retained = _naive_retention(subset.reset_index(drop=True), engine.n_months)
+        np.testing.assert_array_equal(sizes, expected_sizes)
+        np.testing.assert_array_equal(retained, expected_retained)
+
+
+def test_retention_figure_skips_empty_cohorts():
+    ledger = _synthetic_ledger(rows=2000)
+    engine = cohorts.CohortEngine(ledger)
+    figure = cohorts.build_retention_figure(engine, 'Nala')
+    sizes, _ = engine.retention('Nala')
+    assert len(figure.data[0].y) == int((sizes > 0).sum())